@@ -2,13 +2,14 @@
 API Routes - /analyze endpoint with proper request/response models
 """
 
+import asyncio
 import tempfile
 import os
-import gc
-from typing import Optional
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException, status
+from typing import BinaryIO, Optional
+from fastapi import APIRouter, BackgroundTasks, UploadFile, File, Form, HTTPException, status
+from fastapi.responses import ORJSONResponse
 
-from api.models import AnalysisRequest, AnalysisResponse
+from api.models import AnalysisResponse
 from services.gemini_service import GeminiService
 from services.legal_context_loader import LegalContextLoader
 from services.prompt_builder import PromptBuilder
@@ -16,10 +17,13 @@ from utils.pdf_processor import extract_text_from_pdf
 from utils.image_processor import ImageProcessor
 from utils.text_sanitizer import sanitize_and_validate_text
 from utils.response_formatter import format_response
-from utils.file_cleanup import cleanup_temp_file, secure_delete_file
+from utils.file_cleanup import cleanup_multiple_files, secure_delete_file
 from config import (
     MAX_FILE_SIZE_MB,
+    MAX_TEXT_LENGTH,
+    MAX_URL_LENGTH,
     ALLOWED_FILE_TYPES,
+    ALLOWED_FILE_TYPES_DISPLAY,
 )
 
 router = APIRouter()
@@ -29,13 +33,40 @@ legal_loader = LegalContextLoader()
 prompt_builder = PromptBuilder()
 image_processor = ImageProcessor(enable_ocr=False)
 
+UPLOAD_CHUNK_SIZE = 64 * 1024
+MAX_FILE_SIZE_BYTES = MAX_FILE_SIZE_MB * 1024 * 1024
 
-@router.post("/analyze", response_model=AnalysisResponse)
+def _copy_upload(source: BinaryIO, fd: int) -> bool:
+    """
+    Stream upload to disk in chunks, aborting once the size limit is exceeded
+    
+    Runs in a worker thread so the whole copy costs a single event-loop hop.
+    
+    Args:
+        source: Underlying upload file object
+        fd: Open descriptor of the destination temporary file (closed on return)
+    
+    Returns:
+        True if copied, False if the upload exceeds MAX_FILE_SIZE_MB
+    """
+    
+    size = 0
+    with os.fdopen(fd, "wb") as f:
+        while chunk := source.read(UPLOAD_CHUNK_SIZE):
+            size += len(chunk)
+            if size > MAX_FILE_SIZE_BYTES:
+                return False
+            f.write(chunk)
+    return True
+
+
+@router.post("/analyze", response_model=AnalysisResponse, response_class=ORJSONResponse)
 async def analyze(
+    background_tasks: BackgroundTasks,
     text: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
     video_url: Optional[str] = Form(None),
-) -> AnalysisResponse:
+) -> ORJSONResponse:
     """
     Main analysis endpoint - Legal assistant
     
@@ -44,7 +75,7 @@ async def analyze(
     - file: PDF or image (max 5MB)
     - video_url: URL to analyze (max 500 chars)
     
-    Returns: AnalysisResponse (Pydantic model serialized to JSON)
+    Returns: AnalysisResponse (serialized to JSON with orjson)
     
     Example:
         curl -X POST http://localhost:8000/api/analyze \\
@@ -52,6 +83,7 @@ async def analyze(
     """
     
     temp_files = []  
+    cleanup_scheduled = False
     
     try:
         if not text and not file and not video_url:
@@ -60,55 +92,70 @@ async def analyze(
                 detail="Provide at least one of: text, file, or video_url"
             )
         
-        try:
-            request_data = AnalysisRequest(text=text, video_url=video_url)
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
-            )
+        # Same rules as AnalysisRequest, checked inline to avoid a second Pydantic pass
+        if text is not None:
+            if not text.strip():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Text cannot be empty string"
+                )
+            if len(text) > MAX_TEXT_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Text exceeds {MAX_TEXT_LENGTH} characters"
+                )
         
-        extracted_text = ""
-        if request_data.text:
-            extracted_text = sanitize_and_validate_text(request_data.text)
+        if video_url is not None:
+            if not video_url.startswith(("http://", "https://")):
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="URL must start with http:// or https://"
+                )
+            if len(video_url) > MAX_URL_LENGTH:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"URL exceeds {MAX_URL_LENGTH} characters"
+                )
+        
+        # Collect parts and join once (no repeated str concatenation)
+        parts = []
+        if text:
+            parts.append(sanitize_and_validate_text(text))
         
         if file:
-            if file.content_type not in ALLOWED_FILE_TYPES:
+            # Single lookup: resolves the suffix and validates the type
+            suffix = ALLOWED_FILE_TYPES.get(file.content_type)
+            if suffix is None:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Unsupported file type: {file.content_type}.\nAllowed: {list(ALLOWED_FILE_TYPES.keys())}"
+                    detail=f"Unsupported file type: {file.content_type}.\nAllowed: {ALLOWED_FILE_TYPES_DISPLAY}"
                 )
             
-            file_content = await file.read()
-            file_size_mb = len(file_content) / (1024 * 1024)
+            fd, temp_file_path = await asyncio.to_thread(tempfile.mkstemp, suffix=suffix)
+            temp_files.append(temp_file_path)
             
-            if file_size_mb > MAX_FILE_SIZE_MB:
+            if not await asyncio.to_thread(_copy_upload, file.file, fd):
                 raise HTTPException(
                     status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
                     detail=f"File exceeds {MAX_FILE_SIZE_MB}MB limit"
                 )
             
-            suffix = ALLOWED_FILE_TYPES.get(file.content_type, ".tmp")
-            temp_file_path = tempfile.mkstemp(suffix=suffix)
-            temp_files.append(temp_file_path)
-            
-            with open(temp_file_path, "wb") as f:
-                f.write(file_content)
-            
             if file.content_type == "application/pdf":
-                extracted_text += "\n[PDF Document Content]:\n"
-                extracted_text += extract_text_from_pdf(temp_file_path)
+                parts.append("\n[PDF Document Content]:\n")
+                parts.append(await asyncio.to_thread(
+                    extract_text_from_pdf, temp_file_path, max_chars=MAX_TEXT_LENGTH
+                ))
             
             elif file.content_type.startswith("image/"):
-                extracted_text += f"\n[Image Document: {file.filename}]"
+                parts.append(f"\n[Image Document: {file.filename}]")
         
-        if request_data.video_url:
-            extracted_text += f"\n[Video URL for Analysis]: {request_data.video_url}"
+        if video_url:
+            parts.append(f"\n[Video URL for Analysis]: {video_url}")
         
-        # if len(extracted_text) > 3000:
-        #     extracted_text = extracted_text[:3000] + "...[truncated]"
+        extracted_text = "".join(parts)
         
-        legal_context = legal_loader.load_relevant_context(extracted_text)
+        # Off the event loop: the first call parses database/ (memoized in the loader)
+        legal_context = await asyncio.to_thread(legal_loader.load_relevant_context, extracted_text)
         
         system_prompt = prompt_builder.build_system_prompt(legal_context)
         user_message = prompt_builder.build_user_message(extracted_text)
@@ -120,12 +167,23 @@ async def analyze(
         
         response: AnalysisResponse = format_response(gemini_response)
         
-        return response
+        # Serialize directly with orjson, bypassing jsonable_encoder
+        # (built first: if it raises, the finally block still cleans up)
+        json_response = ORJSONResponse(content=response.model_dump())
+        
+        # Secure deletion runs after the response has been sent
+        # (sync tasks are executed in Starlette's threadpool, off the event loop)
+        for temp_file in temp_files:
+            background_tasks.add_task(secure_delete_file, temp_file)
+        cleanup_scheduled = True
+        
+        return json_response
     
     except HTTPException:
         raise
     
-    except Exception as e:
+    except Exception:
+        # No error output here: logging is disabled for anonymity
         # return AnalysisResponse(
         #     qualification="Analysis Error",
         #     applicable_articles=[],
@@ -133,12 +191,8 @@ async def analyze(
         #     advice="Please try again with a different query",
         #     disclaimer="This is general information only"
         # )
-        print("ERROR:", e)
-        raise e
+        raise
     finally:
-        for temp_file in temp_files:
-            if os.path.exists(temp_file):
-                cleanup_temp_file(temp_file)
-                secure_delete_file(temp_file)
-        
-        gc.collect()
\ No newline at end of file
+        # Background tasks never run for failed requests: clean up here instead
+        if not cleanup_scheduled:
+            await asyncio.to_thread(cleanup_multiple_files, temp_files)
\ No newline at end of file
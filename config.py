@@ -30,6 +30,7 @@ ALLOWED_FILE_TYPES = {
     "image/png": ".png",
     "image/webp": ".webp",
 }
+ALLOWED_FILE_TYPES_DISPLAY = ", ".join(ALLOWED_FILE_TYPES)
 
 # ===== PROMPT INJECTION KEYWORDS (Simple Blocklist) =====
 PROMPT_INJECTION_KEYWORDS: Set[str] = {
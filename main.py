@@ -8,13 +8,14 @@ import tempfile
 import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import JSONResponse
-from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 
 logging.disable(logging.CRITICAL)
 
 from api.routes import router as analysis_router
 from middleware.security import SecurityMiddleware
+from middleware.cors import StaticCORSMiddleware
+from config import DEBUG
 
 TEMP_DIR = tempfile.mkdtemp()
 
@@ -26,20 +27,19 @@ async def lifespan(app: FastAPI):
     if os.path.exists(TEMP_DIR):
         shutil.rmtree(TEMP_DIR)
 
+# Interactive docs & OpenAPI schema only in development
 app = FastAPI(
     title="Legal Assistant API",
     version="0.1.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse,
+    docs_url="/docs" if DEBUG else None,
+    redoc_url="/redoc" if DEBUG else None,
+    openapi_url="/openapi.json" if DEBUG else None,
 )
 
-# CORS: Allow only Flutter clients (or adjust as needed)
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],  # In production: specify Flutter app domain
-    allow_credentials=True,  # Stateless
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# CORS: Allow all origins (in production: specify Flutter app domain)
+app.add_middleware(StaticCORSMiddleware)
 
 app.add_middleware(SecurityMiddleware)
 
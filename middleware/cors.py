@@ -0,0 +1,48 @@
+"""
+CORS Middleware - Static wildcard policy as pure ASGI
+"""
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Pre-encoded ASGI header pairs (single "*" policy, no credentials: stateless API)
+_CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+]
+
+_PREFLIGHT_HEADERS = _CORS_HEADERS + [
+    (b"access-control-allow-methods", b"GET, POST, OPTIONS"),
+    (b"access-control-allow-headers", b"*"),
+    (b"access-control-max-age", b"600"),
+]
+
+class StaticCORSMiddleware:
+    """
+    Minimal CORS middleware:
+    - Answers every OPTIONS request as a preflight (204)
+    - Appends static CORS headers to all other responses
+    - No per-request header parsing
+    """
+    
+    def __init__(self, app: ASGIApp):
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        if scope["method"] == "OPTIONS":
+            await send({
+                "type": "http.response.start",
+                "status": 204,
+                "headers": _PREFLIGHT_HEADERS,
+            })
+            await send({"type": "http.response.body", "body": b""})
+            return
+        
+        async def send_with_cors(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + _CORS_HEADERS
+            await send(message)
+        
+        await self.app(scope, receive, send_with_cors)
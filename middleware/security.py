@@ -2,57 +2,84 @@
 Security Middleware - Anonymity & Rate Limiting
 """
 
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
 from starlette.responses import Response
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
-from collections import defaultdict
+from collections import defaultdict, deque
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+from config import RATE_LIMIT_REQUESTS_PER_MINUTE, RATE_LIMIT_CLEANUP_INTERVAL_SECONDS
+
+# Pre-encoded ASGI header pairs appended to every response
+_EXTRA_HEADERS = [
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+]
+
+class SecurityMiddleware:
     """
-    Custom security middleware:
+    Custom security middleware (pure ASGI, no extra task per request):
     - No IP logging
     - Basic rate limiting (per-minute)
     - No session tracking
     """
     
     def __init__(self, app: ASGIApp):
-        super().__init__(app)
-        self.request_times = defaultdict(list)
-        self.max_requests_per_minute = 10
+        self.app = app
+        self.max_requests_per_minute = RATE_LIMIT_REQUESTS_PER_MINUTE
+        # Bounded per-IP window: never holds more than the allowed requests
+        self.request_times = defaultdict(
+            lambda: deque(maxlen=self.max_requests_per_minute)
+        )
+        self.last_sweep = time.time()
+    
+    def _sweep_idle_clients(self, minute_ago: float) -> None:
+        """Forget IPs with no request in the last minute (bounds memory)"""
+        
+        idle = [ip for ip, times in self.request_times.items() if not times or times[-1] <= minute_ago]
+        for ip in idle:
+            del self.request_times[ip]
     
-    async def dispatch(self, request: Request, call_next):
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process request through security checks"""
         
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
         # Extract client IP (but don't log it)
-        client_ip = request.client.host if request.client else "unknown"
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
         
         # Basic rate limiting (in-memory, resets on app restart)
         current_time = time.time()
         minute_ago = current_time - 60
         
-        # Clean old entries
-        self.request_times[client_ip] = [
-            t for t in self.request_times[client_ip] if t > minute_ago
-        ]
+        # Periodically drop idle clients
+        if current_time - self.last_sweep >= RATE_LIMIT_CLEANUP_INTERVAL_SECONDS:
+            self._sweep_idle_clients(minute_ago)
+            self.last_sweep = current_time
+        
+        # Clean old entries (timestamps are appended in order)
+        times = self.request_times[client_ip]
+        while times and times[0] <= minute_ago:
+            times.popleft()
         
         # Check rate limit
-        if len(self.request_times[client_ip]) >= self.max_requests_per_minute:
-            return Response(
+        if len(times) >= self.max_requests_per_minute:
+            response = Response(
                 content="Rate limit exceeded",
                 status_code=429
             )
+            await response(scope, receive, send)
+            return
         
-        self.request_times[client_ip].append(current_time)
-        
-        # Process request
-        response = await call_next(request)
-        
-        # Ensure no sensitive headers leak
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
+        times.append(current_time)
         
-        # Don't log anything
+        async def send_with_headers(message: Message) -> None:
+            # Ensure no sensitive headers leak
+            if message["type"] == "http.response.start":
+                message["headers"] = list(message.get("headers", [])) + _EXTRA_HEADERS
+            await send(message)
         
-        return response
\ No newline at end of file
+        # Process request (don't log anything)
+        await self.app(scope, receive, send_with_headers)
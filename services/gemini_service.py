@@ -4,10 +4,11 @@
 
 import asyncio
 import json
-import re  
+import orjson
 import google.generativeai as genai
 from typing import Dict, Any
 
+from utils.hashing import text_digest
 from config import (
     GEMINI_API_KEY,
     GEMINI_MODEL,
@@ -16,23 +17,46 @@ from config import (
     REQUEST_TIMEOUT_SECONDS,
 )
 
+_GENERATION_CONFIG = {"temperature": 0.1}
+
+# Réponse de timeout statique : sérialisée une seule fois à l'import
+_TIMEOUT_FALLBACK_JSON = orjson.dumps({
+    "qualification": "Délai d'attente dépassé",
+    "applicable_articles": [],
+    "risks": "L'analyse a pris trop de temps.",
+    "advice": "Veuillez réessayer avec une question plus courte.",
+    "disclaimer": "Erreur système."
+}).decode()
+
 class GeminiService:
     def __init__(self):
         if not GEMINI_API_KEY:
             raise ValueError("GEMINI_API_KEY environment variable not set")
         genai.configure(api_key=GEMINI_API_KEY)
         self.model_name = GEMINI_MODEL
+        self._model = genai.GenerativeModel(self.model_name)
+        # Appels Gemini en cours, indexés par empreinte du prompt (jamais le texte)
+        self._in_flight: Dict[str, asyncio.Task] = {}
 
     async def analyze(self, system_prompt: str, user_message: str) -> str:
+        # Les requêtes identiques simultanées partagent un seul appel Gemini.
+        # Pas de batch multi-requêtes : mélanger les questions de plusieurs
+        # utilisateurs dans un même prompt romprait l'isolement entre eux.
+        key = text_digest(f"{system_prompt}\n\n{user_message}")
+        
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._analyze(system_prompt, user_message))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        
+        # shield : l'annulation d'un client n'interrompt pas les autres
+        return await asyncio.shield(task)
+
+    async def _analyze(self, system_prompt: str, user_message: str) -> str:
         try:
-            loop = asyncio.get_event_loop()
             response = await asyncio.wait_for(
-                loop.run_in_executor(
-                    None,
-                    self._call_gemini,
-                    system_prompt,
-                    user_message
-                ),
+                self._call_gemini(system_prompt, user_message),
                 timeout=REQUEST_TIMEOUT_SECONDS
             )
             return response
@@ -44,17 +68,17 @@ class GeminiService:
             traceback.print_exc()
             return self._error_fallback(str(e))
 
-    def _call_gemini(self, system_prompt: str, user_message: str) -> str:
+    async def _call_gemini(self, system_prompt: str, user_message: str) -> str:
         try:
-            model = genai.GenerativeModel(self.model_name)
-            response = model.generate_content(
+            # Appel asynchrone natif : aucun thread de l'executor n'est bloqué
+            response = await self._model.generate_content_async(
                 contents=[{"role": "user", "parts": [f"{system_prompt}\n\n{user_message}"]}],
-                generation_config={"temperature": 0.1}
+                generation_config=_GENERATION_CONFIG
             )
             
             text = response.text.strip()
-            # Nettoyage des balises Markdown
-            text = re.sub(r'```json|```', '', text).strip()
+            # Nettoyage des balises Markdown (remplacements littéraux, sans regex)
+            text = text.replace('```json', '').replace('```', '').strip()
             
             try:
                 data = json.loads(text)
@@ -75,22 +99,16 @@ class GeminiService:
             return self._error_fallback(str(e))
         
     def _timeout_fallback(self) -> str:
-        return json.dumps({
-            "qualification": "Délai d'attente dépassé",
-            "applicable_articles": [],
-            "risks": "L'analyse a pris trop de temps.",
-            "advice": "Veuillez réessayer avec une question plus courte.",
-            "disclaimer": "Erreur système."
-        })
+        return _TIMEOUT_FALLBACK_JSON
 
     def _error_fallback(self, error: str) -> str:
-        return json.dumps({
+        return orjson.dumps({
             "qualification": "Erreur d'analyse",
             "applicable_articles": [],
             "risks": f"Une erreur est survenue : {error[:100]}",
             "advice": "Contactez le support si le problème persiste.",
             "disclaimer": "Erreur système."
-        })
+        }).decode()
 # import asyncio
 # import json
 # import google.generativeai as genai
@@ -125,7 +143,7 @@ class GeminiService:
 #         """
         
 #         try:
-#             loop = asyncio.get_event_loop()
+#             loop = asyncio.get_running_loop()
 #             response = await asyncio.wait_for(
 #                 loop.run_in_executor(
 #                     None,
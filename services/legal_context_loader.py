@@ -3,57 +3,211 @@ Legal Document Loader - Load from database/ folder
 """
 
 import os
+import pickle
+import re
+import tempfile
+import threading
+from functools import cached_property, lru_cache
 from config import DATABASE_PATH
 from utils.pdf_processor import extract_text_from_pdf
 
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 
 class LegalContextLoader:
     """Load relevant legal texts from database/ folder"""
     
+    CACHE_DIR_NAME = ".cache"  # Parsed-text cache, inside database/
+    CACHE_VERSION = 2  # Bump when extract_text_from_pdf output changes
+    
+    # Query keyword -> document-name fragments it selects
+    KEYWORDS = {
+        "cybercrime": ("codes_numeriques", "cybercriminalite"),
+        "data": ("protection_donnees", "gdpr"),
+        "social": ("reseaux_sociaux", "harcelement"),
+        "privacy": ("vie_privee", "protection_donnees"),
+        "identity": ("identite", "usurpation"),
+    }
+    
+    # Core digital-law documents (always included), matched on the lowercase file name
+    _DOC_TERMS = frozenset(("numerique", "donnees"))
+    _DOC_TOKENS = frozenset(("tic",))  # Acronym: whole word only ("article" must not match)
+    
+    EXCERPT_LENGTH = 2000  # Characters of each document sent as context
+    
     def __init__(self):
         self.database_path = DATABASE_PATH
-        self.documents = self._load_documents()
+        self.cache_path = os.path.join(self.database_path, self.CACHE_DIR_NAME)
+        self._automaton = self._build_automaton()
+        # First load happens from worker threads (asyncio.to_thread) and
+        # cached_property has no lock since Python 3.12: parse only once
+        self._documents = None
+        self._documents_lock = threading.Lock()
+        # Per-instance memo (an lru_cache on the method would be shared by all
+        # instances and keep them alive); hit/miss stats via cache_info()
+        self._compute_context = lru_cache(maxsize=256)(self._build_context)
+    
+    def _build_automaton(self):
+        """Aho-Corasick automaton over KEYWORDS (None if pyahocorasick is missing)"""
+        if ahocorasick is None:
+            return None
+        
+        automaton = ahocorasick.Automaton()
+        for keyword in self.KEYWORDS:
+            automaton.add_word(keyword, keyword)
+        automaton.make_automaton()
+        return automaton
+    
+    def _match_keywords(self, user_query_lower: str) -> set:
+        """Keywords occurring in the query, found in one linear scan"""
+        if self._automaton is None:
+            return {keyword for keyword in self.KEYWORDS if keyword in user_query_lower}
+        return {keyword for _, keyword in self._automaton.iter(user_query_lower)}
+    
+    @classmethod
+    def _is_core_document(cls, doc_name: str) -> bool:
+        doc_name_lower = doc_name.lower()
+        if any(term in doc_name_lower for term in cls._DOC_TERMS):
+            return True
+        return not cls._DOC_TOKENS.isdisjoint(re.split(r'[^a-z0-9]+', doc_name_lower))
+    
+    @cached_property
+    def _core_documents(self) -> frozenset:
+        """Names of core documents, computed once"""
+        return frozenset(doc_name for doc_name in self.documents if self._is_core_document(doc_name))
+    
+    @cached_property
+    def _excerpts(self) -> tuple:
+        """(name, truncated content) pairs in document order, computed once"""
+        return tuple(
+            (doc_name, doc_content[:self.EXCERPT_LENGTH])
+            for doc_name, doc_content in self.documents.items()
+        )
+    
+    @cached_property
+    def _keyword_documents(self) -> dict:
+        """Keyword -> names of loaded documents matching its fragments (built once)"""
+        return {
+            keyword: {
+                doc_name for doc_name in self.documents
+                if any(fragment in doc_name.lower() for fragment in fragments)
+            }
+            for keyword, fragments in self.KEYWORDS.items()
+        }
+    
+    @property
+    def documents(self) -> dict:
+        """Parsed documents, loaded lazily on first access (once, even under concurrency)"""
+        documents = self._documents
+        if documents is None:
+            with self._documents_lock:
+                if self._documents is None:
+                    self._documents = self._load_documents()
+                documents = self._documents
+        return documents
     
     def _load_documents(self) -> dict:
-        """Load all legal documents from database/ on startup"""
+        """
+        Load all legal documents from database/
+        
+        Parsed text is cached per file and reused while the file's
+        (extractor version, name, mtime, size) is unchanged, so unchanged PDFs are not re-parsed.
+        """
         documents = {}
         
-        if not os.path.exists(self.database_path):
+        try:
+            entries = os.scandir(self.database_path)
+        except FileNotFoundError:
             return documents
         
-        for filename in os.listdir(self.database_path):
-            if filename.endswith((".txt", ".md", ".pdf")):
-                filepath = os.path.join(self.database_path, filename)
+        with entries:
+            for entry in entries:
+                if not entry.name.endswith((".txt", ".md", ".pdf")) or not entry.is_file():
+                    continue
+                
                 try:
-                    documents[filename] = extract_text_from_pdf(filepath)
+                    stat = entry.stat()
+                    key = (self.CACHE_VERSION, entry.name, stat.st_mtime_ns, stat.st_size)
+                    
+                    text = self._read_cache(entry.name, key)
+                    if text is None:
+                        text = extract_text_from_pdf(entry.path)
+                        if text:
+                            self._write_cache(entry.name, key, text)
+                    
+                    documents[entry.name] = text
                 except Exception:
                     pass
         
         return documents
     
+    def _cache_file(self, filename: str) -> str:
+        return os.path.join(self.cache_path, f"{filename}.pkl")
+    
+    def _read_cache(self, filename: str, key: tuple):
+        """Return cached text if its key matches the file stats, else None"""
+        try:
+            with open(self._cache_file(filename), "rb") as f:
+                cached = pickle.load(f)
+            if cached.get("key") == key:
+                return cached.get("text")
+        except Exception:
+            pass
+        return None
+    
+    def _write_cache(self, filename: str, key: tuple, text: str) -> None:
+        """Write cache entry atomically (temp file + os.replace); best effort"""
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_path, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    pickle.dump({"key": key, "text": text}, f, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_path, self._cache_file(filename))
+            except Exception:
+                os.remove(tmp_path)
+                raise
+        except Exception:
+            pass
+    
     def load_relevant_context(self, user_query: str) -> str: ##### Must be refined
         """
         Simple keyword matching to select relevant legal documents
+        
+        Core digital-law documents are always included; query keywords
+        (matched via Aho-Corasick) add their topic-specific documents.
         """
         
-        keywords = {
-            "cybercrime": ["codes_numeriques", "cybercriminalite"],
-            "data": ["protection_donnees", "gdpr"],
-            "social": ["reseaux_sociaux", "harcelement"],
-            "privacy": ["vie_privee", "protection_donnees"],
-            "identity": ["identite", "usurpation"],
-        }
+        # The context depends only on which keywords matched: use that as cache key
+        matched_keywords = tuple(sorted(self._match_keywords(user_query.lower())))
+        return self._compute_context(matched_keywords)
+    
+    def _build_context(self, matched_keywords: tuple) -> str:
+        """
+        Build the context string for a set of matched keywords (memoized)
+        
+        Args:
+            matched_keywords: Sorted tuple of KEYWORDS found in the query
+        
+        Returns:
+            Concatenated relevant documents, or the default context
+        """
         
-        relevant_docs = ""
-        user_query_lower = user_query.lower()
+        selected_docs = set(self._core_documents)
+        for keyword in matched_keywords:
+            selected_docs |= self._keyword_documents[keyword]
         
-        for doc_name, doc_content in self.documents.items():
-            doc_name_lower = doc_name.lower()
-            
-            if any(term in doc_name_lower for term in ["numerique", "donnees", "TIC"]):
-                relevant_docs += f"\n\n=== {doc_name} ===\n{doc_content[:2000]}"  ##### Why truncate to 2000?
+        # Collect and join once (linear, no repeated string reallocation)
+        parts = [
+            f"\n\n=== {doc_name} ===\n{excerpt}"  ##### Why truncate to 2000?
+            for doc_name, excerpt in self._excerpts
+            if doc_name in selected_docs
+        ]
         
-        return relevant_docs if relevant_docs else self._default_context()
+        return "".join(parts) if parts else self._default_context()
     
     def _default_context(self) -> str:
         """Default legal context if no specific documents loaded"""
@@ -10,25 +10,16 @@ import json
 class PromptBuilder:
     """Build structured prompts for Gemini"""
     
-    def build_system_prompt(self, legal_context: str) -> str:
-        """
-        Build system prompt with legal constraints and response format
-        
-        Args:
-            legal_context: Relevant legal texts from database/
-        
-        Returns:
-            System prompt with instructions and context
-        """
-        expected_structure = {
-            "qualification": "string - legal classification",
-            "applicable_articles": ["string", "string"],
-            "risks": "string - legal consequences",
-            "advice": "string - recommendations",
-            "disclaimer": "string - legal disclaimer"
-        }
-        
-        system_prompt = f"""You are a legal information assistant for a national digital legal aid application.
+    # Static prompt parts, built once at class load
+    _EXPECTED_STRUCTURE_JSON = json.dumps({
+        "qualification": "string - legal classification",
+        "applicable_articles": ["string", "string"],
+        "risks": "string - legal consequences",
+        "advice": "string - recommendations",
+        "disclaimer": "string - legal disclaimer"
+    }, indent=2)
+    
+    _SYSTEM_PROMPT_PREFIX = """You are a legal information assistant for a national digital legal aid application.
 
 CONSTRAINTS:
 1. Analyze only based on national legal frameworks provided below.
@@ -43,11 +34,13 @@ CONSTRAINTS:
 7. Every single answer inside the JSON must be in french(non negociable)
 
 LEGAL CONTEXT (Official Legal Frameworks):
-{legal_context}
+"""
+    
+    _SYSTEM_PROMPT_SUFFIX = f"""
 
 MANDATORY RESPONSE FORMAT (valid JSON):
 You MUST respond ONLY with valid JSON matching this exact structure:
-{json.dumps(expected_structure, indent=2)}
+{_EXPECTED_STRUCTURE_JSON}
 
 IMPORTANT:
 - qualification: Single sentence summarizing the legal issue
@@ -58,9 +51,34 @@ IMPORTANT:
 
 Do NOT deviate from this JSON format.
 """
-        return system_prompt
     
-    def build_user_message(self, user_input: str) -> str:
+    _USER_MESSAGE_PREFIX = """Please analyze the following situation from a legal perspective:
+
+---
+"""
+    
+    _USER_MESSAGE_SUFFIX = """
+---
+
+Provide your response in the JSON format specified in your system instructions.
+Ensure the JSON is valid and parseable.
+"""
+    
+    @staticmethod
+    def build_system_prompt(legal_context: str) -> str:
+        """
+        Build system prompt with legal constraints and response format
+        
+        Args:
+            legal_context: Relevant legal texts from database/
+        
+        Returns:
+            System prompt with instructions and context
+        """
+        return PromptBuilder._SYSTEM_PROMPT_PREFIX + legal_context + PromptBuilder._SYSTEM_PROMPT_SUFFIX
+    
+    @staticmethod
+    def build_user_message(user_input: str) -> str:
         """
         Build user message with input content
         
@@ -70,17 +88,7 @@ Do NOT deviate from this JSON format.
         Returns:
             User message formatted for Gemini
         """
-        
-        user_message = f"""Please analyze the following situation from a legal perspective:
-
----
-{user_input}
----
-
-Provide your response in the JSON format specified in your system instructions.
-Ensure the JSON is valid and parseable.
-"""
-        return user_message
+        return PromptBuilder._USER_MESSAGE_PREFIX + user_input + PromptBuilder._USER_MESSAGE_SUFFIX
     
     @staticmethod
     def get_response_template() -> dict:
@@ -0,0 +1,125 @@
+"""
+Tests - utils/file_cleanup.py storage detection and overwrite strategy
+"""
+
+import os
+
+import pytest
+
+import utils.file_cleanup as file_cleanup
+from utils.file_cleanup import FileCleanup
+
+
+@pytest.fixture
+def big_file(tmp_path):
+    path = tmp_path / "upload.pdf"
+    path.write_bytes(b"secret" * 1000)
+    return str(path)
+
+
+@pytest.fixture
+def overwrite_calls(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        FileCleanup, "_overwrite_pass",
+        staticmethod(lambda path, size, buffer: calls.append(path)),
+    )
+    return calls
+
+
+@pytest.fixture(autouse=True)
+def clear_storage_cache():
+    file_cleanup._storage_kind.cache_clear()
+    yield
+    file_cleanup._storage_kind.cache_clear()
+
+
+def test_ephemeral_storage_unlinks_without_overwrite(monkeypatch, big_file, overwrite_calls):
+    monkeypatch.setattr(file_cleanup, "_storage_kind", lambda d, dev: file_cleanup.STORAGE_EPHEMERAL)
+    
+    assert FileCleanup.secure_delete_file(big_file)
+    assert not os.path.exists(big_file)
+    assert overwrite_calls == []
+
+
+def test_ssd_storage_uses_single_pass(monkeypatch, big_file, overwrite_calls):
+    monkeypatch.setattr(file_cleanup, "_storage_kind", lambda d, dev: file_cleanup.STORAGE_SSD)
+    
+    assert FileCleanup.secure_delete_file(big_file)
+    assert not os.path.exists(big_file)
+    assert overwrite_calls == [big_file]
+
+
+def test_disk_storage_uses_all_passes(monkeypatch, big_file, overwrite_calls):
+    monkeypatch.setattr(file_cleanup, "_storage_kind", lambda d, dev: file_cleanup.STORAGE_DISK)
+    
+    assert FileCleanup.secure_delete_file(big_file)
+    assert not os.path.exists(big_file)
+    assert overwrite_calls == [big_file] * FileCleanup.OVERWRITE_PASSES
+
+
+def test_mount_points_decodes_octal_escapes(tmp_path):
+    mounts = tmp_path / "mounts"
+    mounts.write_text("/dev/sda1 /mnt/my\\040disk ext4 rw 0 0\n")
+    
+    assert file_cleanup._mount_points(str(mounts)) == [("/mnt/my disk", "ext4")]
+
+
+def test_mount_points_prefers_last_entry_and_longest_first(tmp_path):
+    mounts = tmp_path / "mounts"
+    mounts.write_text(
+        "/dev/sda1 / ext4 rw 0 0\n"
+        "/dev/sda2 /tmp ext4 rw 0 0\n"
+        "tmpfs /tmp tmpfs rw 0 0\n"
+    )
+    
+    assert file_cleanup._mount_points(str(mounts)) == [("/tmp", "tmpfs"), ("/", "ext4")]
+
+
+def test_mount_points_missing_file_returns_empty(tmp_path):
+    assert file_cleanup._mount_points(str(tmp_path / "missing")) == []
+
+
+@pytest.mark.parametrize("mounts, rotational, expected", [
+    ([("/data", "tmpfs"), ("/", "ext4")], True, file_cleanup.STORAGE_EPHEMERAL),
+    ([("/data", "ext4"), ("/", "tmpfs")], False, file_cleanup.STORAGE_SSD),
+    ([("/", "ext4")], True, file_cleanup.STORAGE_DISK),
+    ([("/", "ext4")], None, file_cleanup.STORAGE_DISK),
+    ([("/datastore", "tmpfs"), ("/", "ext4")], None, file_cleanup.STORAGE_DISK),
+])
+def test_storage_kind(monkeypatch, mounts, rotational, expected):
+    monkeypatch.setattr(file_cleanup, "_mount_points", lambda: mounts)
+    monkeypatch.setattr(file_cleanup, "_is_rotational", lambda dev: rotational)
+    monkeypatch.setattr(file_cleanup.os.path, "realpath", lambda p: p)
+    
+    assert file_cleanup._storage_kind("/data/uploads", 0) == expected
+
+
+def test_symlink_is_unlinked_without_touching_target(tmp_path):
+    outside = tmp_path / "outside"
+    outside.mkdir()
+    target = outside / "keep.txt"
+    target.write_bytes(b"abcdefghijklmnopqrstuvwxyz" * 100)
+    
+    uploads = tmp_path / "uploads"
+    uploads.mkdir()
+    (uploads / "small_link").symlink_to(outside / "small.txt")
+    (outside / "small.txt").write_bytes(b"abcdefghijklmnopqrstuvwxyz")
+    (uploads / "link").symlink_to(target)
+    
+    assert FileCleanup.cleanup_directory(str(uploads))
+    assert not uploads.exists()
+    assert target.read_bytes() == b"abcdefghijklmnopqrstuvwxyz" * 100
+    assert (outside / "small.txt").read_bytes() == b"abcdefghijklmnopqrstuvwxyz"
+
+
+def test_secure_delete_symlink_path_keeps_target(tmp_path, overwrite_calls):
+    target = tmp_path / "keep.txt"
+    target.write_bytes(b"x" * 2048)
+    link = tmp_path / "link"
+    link.symlink_to(target)
+    
+    assert FileCleanup.secure_delete_file(str(link))
+    assert not os.path.lexists(link)
+    assert target.read_bytes() == b"x" * 2048
+    assert overwrite_calls == []
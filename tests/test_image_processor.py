@@ -0,0 +1,81 @@
+"""
+Tests - utils/image_processor.py JPEG header parsing and dimension checks
+"""
+
+import pytest
+from PIL import Image
+
+from utils.image_processor import ImageProcessor, _jpeg_dimensions
+
+
+@pytest.fixture
+def processor():
+    return ImageProcessor()
+
+
+def _save_image(path, size, **save_kwargs):
+    Image.new("RGB", size, (200, 30, 30)).save(path, **save_kwargs)
+    return str(path)
+
+
+@pytest.mark.parametrize("progressive", [False, True])
+def test_jpeg_dimensions_reads_sof(tmp_path, progressive):
+    path = _save_image(tmp_path / "photo.jpg", (321, 123), format="JPEG", progressive=progressive)
+    
+    assert _jpeg_dimensions(path) == (321, 123)
+
+
+def test_jpeg_dimensions_truncated_header(tmp_path, processor):
+    full = _save_image(tmp_path / "full.jpg", (64, 48), format="JPEG")
+    with open(full, "rb") as f:
+        data = f.read()
+    # Cut inside the first APP0 segment, before any SOF marker
+    truncated = tmp_path / "truncated.jpg"
+    truncated.write_bytes(data[:8])
+    
+    assert _jpeg_dimensions(str(truncated)) is None
+    assert processor.validate_image_dimensions(str(truncated)) is False
+
+
+def test_jpeg_dimensions_rejects_short_segment_length(tmp_path):
+    # APP0 with length 1 (< 2, which would seek backwards), then a valid SOF0
+    path = tmp_path / "corrupt.jpg"
+    path.write_bytes(
+        b"\xff\xd8"
+        b"\xff\xe0\x00\x01"
+        b"\xff\xc0\x00\x11\x08\x00\x10\x00\x20"
+    )
+    
+    assert _jpeg_dimensions(str(path)) is None
+
+
+def test_non_jpeg_falls_back_to_pil(tmp_path, processor):
+    path = _save_image(tmp_path / "image.png", (5000, 10), format="PNG")
+    
+    assert _jpeg_dimensions(path) is None
+    assert processor.validate_image_dimensions(path) is False
+    assert processor.validate_image_dimensions(path, max_width=5000) is True
+
+
+def test_validate_image_dimensions_jpeg(tmp_path, processor):
+    path = _save_image(tmp_path / "photo.jpg", (800, 600), format="JPEG")
+    
+    assert processor.validate_image_dimensions(path) is True
+    assert processor.validate_image_dimensions(path, max_height=599) is False
+
+
+SOF0_16x32 = b"\xff\xc0\x00\x11\x08\x00\x10\x00\x20"
+
+
+@pytest.mark.parametrize("payload", [
+    # SOS before any SOF: scan data is not walked (a marker-like run inside must not be read)
+    b"\xff\xd8\xff\xda\x00\x08\x01\x01\x00\x00\x3f\x00" + b"\x12\x34" * 1000 + SOF0_16x32,
+    # Stuffed FF 00 where a marker is expected: not a segment with a length
+    b"\xff\xd8\xff\x00\x00\x02" + SOF0_16x32,
+], ids=["sos_before_sof", "stuffed_byte"])
+def test_jpeg_dimensions_stops_at_scan_or_stuffed_byte(tmp_path, processor, payload):
+    path = tmp_path / "corrupt.jpg"
+    path.write_bytes(payload)
+    
+    assert _jpeg_dimensions(str(path)) is None
+    assert processor.validate_image_dimensions(str(path)) is False
@@ -0,0 +1,90 @@
+"""
+Tests - middleware/security.py rate limiting and headers, middleware/cors.py preflight
+"""
+
+import os
+import types
+
+# config refuses to import without a key; none is used by these tests
+os.environ.setdefault("GEMINI_API_KEY", "test-key")
+
+import pytest
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+import middleware.security as security
+from config import RATE_LIMIT_REQUESTS_PER_MINUTE
+from middleware.cors import StaticCORSMiddleware
+from middleware.security import SecurityMiddleware
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+    
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Only the middleware's clock: the test client keeps the real one
+    monkeypatch.setattr(security, "time", types.SimpleNamespace(time=fake.time))
+    return fake
+
+
+@pytest.fixture
+def client(clock):
+    async def ping(request):
+        return PlainTextResponse("pong")
+    
+    app = Starlette(routes=[Route("/ping", ping, methods=["GET", "POST"])])
+    app.add_middleware(StaticCORSMiddleware)
+    app.add_middleware(SecurityMiddleware)
+    return TestClient(app)
+
+
+def test_requests_over_limit_get_429(client):
+    for _ in range(RATE_LIMIT_REQUESTS_PER_MINUTE):
+        assert client.get("/ping").status_code == 200
+    
+    response = client.get("/ping")
+    assert response.status_code == 429
+    assert response.text == "Rate limit exceeded"
+
+
+def test_rate_limit_window_expires_after_a_minute(client, clock):
+    for _ in range(RATE_LIMIT_REQUESTS_PER_MINUTE):
+        client.get("/ping")
+    assert client.get("/ping").status_code == 429
+    
+    clock.now += 59
+    assert client.get("/ping").status_code == 429
+    
+    clock.now += 1
+    assert client.get("/ping").status_code == 200
+
+
+def test_security_headers_added(client):
+    response = client.get("/ping")
+    
+    assert response.headers["x-content-type-options"] == "nosniff"
+    assert response.headers["x-frame-options"] == "DENY"
+    assert response.headers["access-control-allow-origin"] == "*"
+
+
+def test_options_preflight_returns_204(client):
+    response = client.options(
+        "/ping",
+        headers={"Origin": "https://app.example", "Access-Control-Request-Method": "POST"},
+    )
+    
+    assert response.status_code == 204
+    assert response.content == b""
+    assert response.headers["access-control-allow-origin"] == "*"
+    assert response.headers["access-control-allow-methods"] == "GET, POST, OPTIONS"
+    assert response.headers["access-control-allow-headers"] == "*"
+    assert response.headers["access-control-max-age"] == "600"
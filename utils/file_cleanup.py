@@ -4,27 +4,149 @@ Secure deletion with overwrite before removal
 """
 
 import os
+import re
 import shutil
-from typing import Optional, List
+from stat import S_ISREG
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterator, Optional, List, Union
 import logging
 
 # Disable logging for this module
 logging.disable(logging.CRITICAL)
 
+# Filesystems whose data never reaches persistent storage
+_EPHEMERAL_FS_TYPES = frozenset(("tmpfs", "ramfs", "devtmpfs"))
+
+_OCTAL_ESCAPE_RE = re.compile(r'\\([0-7]{3})')
+
+STORAGE_EPHEMERAL = "ephemeral"  # RAM-backed: plain unlink is enough
+STORAGE_SSD = "ssd"              # Wear-leveled: extra passes don't hit the same cells
+STORAGE_DISK = "disk"            # Rotational or unknown: full multi-pass overwrite
+
+def _mount_points(mounts_file: str = "/proc/mounts") -> List[tuple]:
+    """
+    (mount point, fs type) pairs from /proc/mounts, longest mount point first
+    
+    When a mount point is listed more than once, the last entry is the one
+    in effect (it stacks over the earlier ones) and is the one kept.
+    """
+    
+    mounts = {}
+    try:
+        with open(mounts_file) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 3:
+                    # Mount points escape spaces etc. as octal (\040)
+                    mount_point = _OCTAL_ESCAPE_RE.sub(lambda m: chr(int(m.group(1), 8)), fields[1])
+                    mounts[mount_point] = fields[2]
+    except OSError:
+        pass
+    
+    return sorted(mounts.items(), key=lambda m: len(m[0]), reverse=True)
+
+def _is_rotational(st_dev: int) -> Optional[bool]:
+    """Read the block device's queue/rotational flag from sysfs (partition or disk)"""
+    
+    sys_dir = f"/sys/dev/block/{os.major(st_dev)}:{os.minor(st_dev)}"
+    for candidate in ("queue/rotational", "../queue/rotational"):
+        try:
+            with open(os.path.join(sys_dir, candidate)) as f:
+                return f.read().strip() == "1"
+        except OSError:
+            continue
+    return None
+
+@lru_cache(maxsize=128)
+def _storage_kind(dir_path: str, st_dev: int) -> str:
+    """
+    Classify the storage backing a directory (cached per directory)
+    
+    Linux only (/proc/mounts, /sys); anywhere else falls back to STORAGE_DISK
+    
+    Args:
+        dir_path: Directory containing the file
+        st_dev: Device id of the file
+    
+    Returns:
+        STORAGE_EPHEMERAL, STORAGE_SSD or STORAGE_DISK
+    """
+    
+    real_dir = os.path.realpath(dir_path)
+    for mount_point, fs_type in _mount_points():
+        if real_dir == mount_point or real_dir.startswith(mount_point.rstrip("/") + "/"):
+            if fs_type in _EPHEMERAL_FS_TYPES:
+                return STORAGE_EPHEMERAL
+            break
+    
+    if hasattr(os, "major") and _is_rotational(st_dev) is False:
+        return STORAGE_SSD
+    
+    return STORAGE_DISK
+
 class FileCleanup:
     """Secure file cleanup utility"""
     
     # Secure deletion strategies
     OVERWRITE_PASSES = 3  # Number of overwrite passes
-    CHUNK_SIZE = 8192     # 8KB chunks for large files
+    CHUNK_SIZE = 8 * 1024 * 1024  # 8MiB write buffer (amortizes write() calls)
+    PARALLEL_THRESHOLD = 64 * 1024 * 1024  # Files >= 64MB: chunks written concurrently
+    MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
     
     @staticmethod
-    def secure_delete_file(file_path: str, verbose: bool = False) -> bool:
+    def _overwrite_pass(file_path: str, file_size: int, buffer: memoryview) -> None:
+        """
+        Overwrite a file once, in place, with the contents of buffer (repeated)
+        
+        Large files are split into buffer-sized chunks written concurrently
+        with os.pwrite (positional, thread-safe) where available.
+        
+        Args:
+            file_path: File to overwrite
+            file_size: Size of the file in bytes
+            buffer: Random data to write
+        """
+        
+        chunk_size = len(buffer)
+        
+        if file_size < FileCleanup.PARALLEL_THRESHOLD or not hasattr(os, "pwrite"):
+            # In place ("r+b" keeps the same blocks; "wb" would truncate first
+            # and the new data could land elsewhere)
+            with open(file_path, "r+b") as f:
+                bytes_written = 0
+                while bytes_written < file_size:
+                    to_write = min(chunk_size, file_size - bytes_written)
+                    f.write(buffer[:to_write])
+                    bytes_written += to_write
+                # Make sure the pass reaches the disk, not just the page cache
+                f.flush()
+                os.fsync(f.fileno())
+            return
+        
+        fd = os.open(file_path, os.O_WRONLY)
+        try:
+            def write_chunk(offset: int) -> None:
+                to_write = min(chunk_size, file_size - offset)
+                written = 0
+                while written < to_write:
+                    written += os.pwrite(fd, buffer[written:to_write], offset + written)
+            
+            with ThreadPoolExecutor(max_workers=FileCleanup.MAX_WORKERS) as executor:
+                list(executor.map(write_chunk, range(0, file_size, chunk_size)))
+            
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+    
+    @staticmethod
+    def secure_delete_file(file_path: Union[str, os.DirEntry], verbose: bool = False) -> bool:
         """
         Securely delete a single file by overwriting before deletion
         
         Args:
-            file_path: Path to file to delete
+            file_path: Path to file to delete, or a DirEntry from os.scandir
+                (reuses its stat result instead of re-statting)
             verbose: Whether to log errors (should be False for security)
         
         Returns:
@@ -32,25 +154,42 @@ class FileCleanup:
         """
         
         try:
-            if not os.path.exists(file_path):
+            # Single stat() instead of exists() + getsize()
+            try:
+                if isinstance(file_path, os.DirEntry):
+                    stat = file_path.stat(follow_symlinks=False)
+                    file_path = file_path.path
+                else:
+                    stat = os.lstat(file_path)
+            except FileNotFoundError:
                 return True
+            file_size = stat.st_size
             
-            file_size = os.path.getsize(file_path)
+            # Never write through a symlink (or into a FIFO/device): drop the entry only
+            if not S_ISREG(stat.st_mode):
+                os.remove(file_path)
+                return True
+            
+            storage = _storage_kind(os.path.dirname(os.path.abspath(file_path)), stat.st_dev)
+            
+            # RAM-backed (tmpfs): data never reached a disk, overwriting is pure waste
+            if storage == STORAGE_EPHEMERAL:
+                os.remove(file_path)
+                return True
             
             # Don't bother overwriting tiny files (<512Bytes)
             if file_size > 512:
-                # Multiple overwrite passes
-                for _ in range(FileCleanup.OVERWRITE_PASSES):
-                    with open(file_path, "wb") as f:
-                        bytes_written = 0
-                        while bytes_written < file_size:
-                            chunk = os.urandom(FileCleanup.CHUNK_SIZE)
-                            to_write = min(FileCleanup.CHUNK_SIZE, file_size - bytes_written)
-                            f.write(chunk[:to_write])
-                            bytes_written += to_write
+                # Multiple overwrite passes (one on SSDs: wear leveling remaps
+                # rewrites, so extra passes add cost without reaching old cells)
+                passes = 1 if storage == STORAGE_SSD else FileCleanup.OVERWRITE_PASSES
+                buffer = memoryview(bytearray(min(FileCleanup.CHUNK_SIZE, file_size)))
+                for _ in range(passes):
+                    # One CSPRNG call per pass, reused for every chunk
+                    buffer[:] = os.urandom(len(buffer))
+                    FileCleanup._overwrite_pass(file_path, file_size, buffer)
             else:
                 # Simple overwrite for small files
-                with open(file_path, "wb") as f:
+                with open(file_path, "r+b") as f:
                     f.write(b'\x00' * file_size)
             
             # Delete file
@@ -85,12 +224,35 @@ class FileCleanup:
             Number of successfully deleted files
         """
         
-        deleted_count = 0
-        for file_path in file_paths:
-            if FileCleanup.secure_delete_file(file_path, verbose=False):
-                deleted_count += 1
+        if len(file_paths) <= 1:
+            return sum(FileCleanup.secure_delete_file(p, verbose=False) for p in file_paths)
+        
+        # I/O bound: shred files concurrently, count from the returned results
+        workers = min(FileCleanup.MAX_WORKERS, len(file_paths))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(FileCleanup.secure_delete_file, file_paths))
         
-        return deleted_count
+        return sum(results)
+    
+    @staticmethod
+    def _iter_files(dir_path: str) -> Iterator[os.DirEntry]:
+        """
+        Recursively yield file entries under dir_path (os.scandir based)
+        
+        Args:
+            dir_path: Directory to walk
+        
+        Yields:
+            DirEntry for each file (symlinks are not followed; they are
+            yielded as entries and only unlinked by secure_delete_file)
+        """
+        
+        with os.scandir(dir_path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from FileCleanup._iter_files(entry.path)
+                else:
+                    yield entry
     
     @staticmethod
     def cleanup_directory(dir_path: str, recursive: bool = True) -> bool:
@@ -106,20 +268,18 @@ class FileCleanup:
         """
         
         try:
-            if not os.path.exists(dir_path):
-                return True
-            
             if recursive:
                 # Secure delete each file first
-                for root, dirs, files in os.walk(dir_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        FileCleanup.secure_delete_file(file_path, verbose=False)
+                for entry in FileCleanup._iter_files(dir_path):
+                    FileCleanup.secure_delete_file(entry, verbose=False)
             
             # Remove directory structure
             shutil.rmtree(dir_path)
             return True
         
+        except FileNotFoundError:
+            return True
+        
         except Exception:
             return False
     
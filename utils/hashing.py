@@ -0,0 +1,30 @@
+"""
+Text Digests - Cache/dedup keys that never store the text itself
+"""
+
+import hashlib
+
+try:
+    from blake3 import blake3 as _blake3
+except ImportError:
+    _blake3 = None
+
+DIGEST_SIZE = 16  # bytes (32 hex chars)
+
+def text_digest(text: str) -> str:
+    """
+    Compute a short hex digest of text for use as a cache key
+    
+    Uses blake3 (Rust, SIMD) when installed, else hashlib.blake2b (C)
+    
+    Args:
+        text: Text to fingerprint
+    
+    Returns:
+        Hex digest string
+    """
+    
+    data = text.encode()
+    if _blake3 is not None:
+        return _blake3(data).hexdigest(length=DIGEST_SIZE)
+    return hashlib.blake2b(data, digest_size=DIGEST_SIZE).hexdigest()
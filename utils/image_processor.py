@@ -4,8 +4,80 @@ Image Processing - Optional OCR for Scanned Documents
 
 import base64
 import io
-from typing import Optional
-from pathlib import Path
+import mmap
+import os
+import struct
+from typing import Iterator, Optional, Tuple
+
+BASE64_CHUNK_SIZE = 3 * 1024 * 1024  # Multiple of 3: chunks encode without padding
+MMAP_MIN_SIZE = 1024 * 1024  # Below this, mmap setup costs more than a plain read
+
+_MIME_MAP = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.webp': 'image/webp',
+    '.gif': 'image/gif',
+}
+
+# JPEG start-of-frame markers carrying dimensions (excludes DHT, JPG, DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+def _jpeg_dimensions(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Read (width, height) from a JPEG's SOF segment without decoding it
+    
+    Args:
+        file_path: Path to image
+    
+    Returns:
+        (width, height), or None if not a JPEG / no SOF marker found
+    """
+    
+    with open(file_path, "rb") as f:
+        if f.read(2) != b"\xff\xd8":
+            return None
+        
+        while True:
+            byte = f.read(1)
+            if not byte:
+                return None
+            if byte != b"\xff":
+                continue
+            
+            # Skip fill bytes
+            marker = f.read(1)
+            while marker == b"\xff":
+                marker = f.read(1)
+            if not marker:
+                return None
+            code = marker[0]
+            
+            # Scan data (SOS) or a stuffed byte (FF 00) before any SOF: the
+            # header is malformed, let the caller fall back to PIL
+            if code == 0xDA or code == 0x00:
+                return None
+            
+            # Standalone markers (no length field)
+            if code == 0x01 or 0xD0 <= code <= 0xD9:
+                continue
+            
+            header = f.read(2)
+            if len(header) != 2:
+                return None
+            (length,) = struct.unpack(">H", header)
+            if length < 2:
+                # Corrupt length (it counts its own two bytes): seeking would go backwards
+                return None
+            
+            if code in _JPEG_SOF_MARKERS:
+                frame = f.read(5)
+                if len(frame) != 5:
+                    return None
+                height, width = struct.unpack(">xHH", frame)
+                return width, height
+            
+            f.seek(length - 2, os.SEEK_CUR)
 
 class ImageProcessor:
     """Handle image extraction and optional OCR"""
@@ -40,8 +112,8 @@ class ImageProcessor:
         
         try:
             # Get file info
-            filename = Path(file_path).name
-            file_size = Path(file_path).stat().st_size / 1024  # KB
+            filename = os.path.basename(file_path)
+            file_size = os.stat(file_path).st_size / 1024  # KB
             
             if not self.enable_ocr:
                 # Simple approach: Let Gemini handle the image directly
@@ -72,24 +144,46 @@ class ImageProcessor:
         """
         
         try:
-            with open(file_path, "rb") as f:
-                image_data = f.read()
-                return base64.b64encode(image_data).decode('utf-8')
+            return "".join(self.iter_image_base64(file_path))
         except Exception as e:
             return ""
     
+    def iter_image_base64(self, file_path: str, chunk_size: int = BASE64_CHUNK_SIZE) -> Iterator[str]:
+        """
+        Yield base64 encoding of an image chunk by chunk (for streaming callers)
+        
+        Peak memory is about one chunk, whatever the image size.
+        
+        Args:
+            file_path: Path to image file
+            chunk_size: Raw bytes per chunk (must be a multiple of 3)
+        
+        Yields:
+            Base64 encoded chunks; concatenated they equal the full encoding
+        """
+        
+        if chunk_size <= 0 or chunk_size % 3:
+            raise ValueError("chunk_size must be a positive multiple of 3")
+        
+        with open(file_path, "rb") as f:
+            file_size = os.fstat(f.fileno()).st_size
+            
+            if file_size < MMAP_MIN_SIZE:
+                # Small image (or empty: mmap rejects zero length)
+                data = f.read()
+                if data:
+                    yield base64.b64encode(data).decode('ascii')
+                return
+            
+            # Encode straight from the mapped file: no intermediate full copy
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                for offset in range(0, file_size, chunk_size):
+                    yield base64.b64encode(mm[offset:offset + chunk_size]).decode('ascii')
+    
     def get_mime_type_from_file(self, file_path: str) -> Optional[str]:
         """Determine MIME type from file extension"""
         
-        ext = Path(file_path).suffix.lower()
-        mime_map = {
-            '.jpg': 'image/jpeg',
-            '.jpeg': 'image/jpeg',
-            '.png': 'image/png',
-            '.webp': 'image/webp',
-            '.gif': 'image/gif',
-        }
-        return mime_map.get(ext)
+        return _MIME_MAP.get(os.path.splitext(file_path)[1].lower())
     
     def validate_image_dimensions(self, file_path: str, max_width: int = 4096, max_height: int = 4096) -> bool:
         """
@@ -105,9 +199,14 @@ class ImageProcessor:
         """
         
         try:
-            from PIL import Image
-            image = Image.open(file_path)
-            width, height = image.size
+            # Fast path: JPEG size straight from the SOF header
+            dimensions = _jpeg_dimensions(file_path)
+            if dimensions is None:
+                from PIL import Image
+                # Header-only parse; "with" releases the file handle immediately
+                with Image.open(file_path) as image:
+                    dimensions = image.size
+            width, height = dimensions
             
             if width > max_width or height > max_height:
                 return False
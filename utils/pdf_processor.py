@@ -2,65 +2,69 @@ import fitz
 import re
 from collections import Counter
 
-def extract_text_from_pdf(file_path: str) -> str:
-    try:
-        doc = fitz.open(file_path)
-        full_text = []
-
-        for page in doc:
-            blocks = page.get_text("blocks")
-            page_height = page.rect.height
-
-            for block in blocks:
-                x0, y0, x1, y1, text, *_ = block
-
-                # Supprimer header (haut 10%) et footer (bas 10%)
-                if y0 < page_height * 0.1:
-                    continue
-                if y1 > page_height * 0.9:
-                    continue
-
-                clean_block = text.strip()
-                if clean_block:
-                    full_text.append(clean_block)
+_SPACES_RE = re.compile(r'[ \t]+')
 
-        text = "\n".join(full_text)
+def _keep_line(line: str) -> bool:
+    """Filtre de ligne (sur la ligne sans espaces de bord) : sommaire,
+    numéros de page et lignes trop courtes"""
 
-        # ------------------------
-        # SUPPRESSION SOMMAIRE
-        # ------------------------
+    # Supprimer lignes très courtes inutiles (< 3 caractères)
+    if len(line) <= 2:
+        return False
 
-        # Supprimer lignes avec trop de points (typique sommaire)
-        text = re.sub(r'^.*\.{3,}.*$', '', text, flags=re.MULTILINE)
+    # Lignes avec seulement un nombre (numéros de page)
+    if line.isdecimal():
+        return False
 
-        # Supprimer lignes contenant "Sommaire" ou "Table des matières"
-        text = re.sub(r'(?i)^.*(sommaire|table des matières).*$',
-                    '', text, flags=re.MULTILINE)
+    # Supprimer lignes avec trop de points (typique sommaire)
+    if '...' in line:
+        return False
 
-        # ------------------------
-        # SUPPRESSION NUMÉROS DE PAGE
-        # ------------------------
+    # Supprimer lignes contenant "Sommaire" ou "Table des matières"
+    line_lower = line.lower()
+    if 'sommaire' in line_lower or 'table des matières' in line_lower:
+        return False
 
-        # Lignes avec seulement un nombre
-        text = re.sub(r'^\s*\d+\s*$', '', text, flags=re.MULTILINE)
+    return True
 
-        # ------------------------
-        # NETTOYAGE GÉNÉRAL
-        # ------------------------
-
-        # Supprimer multiples lignes vides
-        text = re.sub(r'\n\s*\n+', '\n\n', text)
-
-        # Supprimer espaces multiples
-        text = re.sub(r'[ \t]+', ' ', text)
-
-        # Supprimer lignes très courtes inutiles (< 3 caractères)
-        text = "\n".join(
-            line for line in text.split("\n")
-            if len(line.strip()) > 2
-        )
-
-        return text[:1000000]
+def extract_text_from_pdf(file_path: str, max_chars: int = 1000000) -> str:
+    try:
+        full_text = []
+        total_chars = 0
+
+        # "with" : le document est fermé même en cas d'erreur ou d'arrêt anticipé
+        with fitz.open(file_path) as doc:
+            for page in doc:
+                # Supprimer header (haut 10%) et footer (bas 10%) : la zone est
+                # découpée par MuPDF, qui n'extrait jamais ce texte
+                r = page.rect
+                clip = fitz.Rect(r.x0, r.y0 + r.height * 0.1, r.x1, r.y1 - r.height * 0.1)
+                blocks = page.get_text("blocks", clip=clip)
+
+                for block in blocks:
+                    x0, y0, x1, y1, text, *_ = block
+
+                    # Le clip garde les blocs à cheval sur la limite (ex. numéros
+                    # de page en pied) : on les rejette en entier, comme avant
+                    if y0 < clip.y0 or y1 > clip.y1:
+                        continue
+
+                    # Un seul passage : espaces multiples fusionnés puis filtrage,
+                    # les lignes vides disparaissent au passage
+                    for raw_line in text.strip().split("\n"):
+                        line = _SPACES_RE.sub(' ', raw_line)
+                        if _keep_line(line.strip()):
+                            full_text.append(line)
+                            total_chars += len(line) + 1
+
+                    # Arrêt anticipé : budget atteint, le reste serait tronqué
+                    if total_chars >= max_chars:
+                        break
+
+                if total_chars >= max_chars:
+                    break
+
+        return "\n".join(full_text)[:max_chars]
 
     except Exception as e:
         print(f"Erreur : {e}")
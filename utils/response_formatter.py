@@ -4,12 +4,36 @@ Ensures responses match AnalysisResponse model
 """
 
 import json
+import orjson
 import re
 from typing import Dict, Any
 
 from api.models import AnalysisResponse
 from config import LEGAL_DISCLAIMER
 
+# Article references like "Article 12", "Loi 2023-X", "Décret..."
+# Scanned separately: an "Article N - ..." match may contain a Loi/Code reference
+_ARTICLE_PATTERNS = (
+    re.compile(r'Article\s+\d+[A-Za-z]?(?:\s*-\s*[^,\n]*)?'),
+    re.compile(r'Loi\s+\d{4}-\d+'),
+    re.compile(r'Décret\s+\d{4}-\d+'),
+    re.compile(r'Code\s+[A-Za-z]+'),
+)
+MAX_ARTICLES = 10
+_ARTICLE_SEPARATOR_RE = re.compile(r'[,\n]')
+_STRING_FIELDS = ("qualification", "risks", "advice")
+
+def _compile_section_re(section_name: str) -> "re.Pattern":
+    """First line mentioning section_name, capturing the (up to) 3 lines after it"""
+    return re.compile(
+        rf'^[^\n]*{re.escape(section_name)}[^\n]*\n?((?:[^\n]*\n?){{0,3}})',
+        re.IGNORECASE | re.MULTILINE,
+    )
+
+_SECTION_RES = {
+    name: _compile_section_re(name) for name in ("qualification", "risks", "advice")
+}
+
 def format_response(gemini_response: str) -> AnalysisResponse:
     """
     Parse Gemini response and ensure it matches AnalysisResponse model
@@ -18,21 +42,27 @@ def format_response(gemini_response: str) -> AnalysisResponse:
         gemini_response: Raw response from Gemini API
     
     Returns:
-        AnalysisResponse validated Pydantic model
+        AnalysisResponse model (fields normalized here, so Pydantic validation is skipped)
     
     Raises:
         ValueError: If response cannot be parsed
     """
     
     try:
-        # Try to parse as JSON
-        response_data = json.loads(gemini_response)
+        # Try to parse as JSON (orjson; its JSONDecodeError subclasses json's).
+        # Slice to the outermost braces so prose around the object is ignored.
+        payload = gemini_response.strip()
+        start = payload.find('{')
+        end = payload.rfind('}')
+        if start != -1 and end > start:
+            payload = payload[start:end + 1]
+        response_data = orjson.loads(payload)
         
         # Validate and clean required fields
         response_data = _validate_response_fields(response_data)
         
-        # Create AnalysisResponse model (validates schema)
-        return AnalysisResponse(**response_data)
+        # Fields already normalized: build without re-running validation
+        return AnalysisResponse.model_construct(**response_data)
     
     except json.JSONDecodeError:
         # Fallback: parse as text and extract sections
@@ -40,7 +70,7 @@ def format_response(gemini_response: str) -> AnalysisResponse:
     
     except Exception as e:
         # Last resort: return generic error response
-        return AnalysisResponse(
+        return AnalysisResponse.model_construct(
             qualification="Unable to analyze request",
             applicable_articles=[],
             risks="System error occurred during analysis",
@@ -60,38 +90,26 @@ def _validate_response_fields(response_data: dict) -> dict:
         Cleaned response dictionary
     """
     
-    # Ensure all required fields exist
-    required_fields = {
-        "qualification": "",
-        "applicable_articles": [],
-        "risks": "",
-        "advice": "",
-        "disclaimer": LEGAL_DISCLAIMER
-    }
-    
-    for field, default_value in required_fields.items():
-        if field not in response_data or response_data[field] is None:
-            response_data[field] = default_value
-    
-    # Validate field types
-    if not isinstance(response_data.get("qualification"), str):
-        response_data["qualification"] = str(response_data.get("qualification", ""))
-    
-    if not isinstance(response_data.get("applicable_articles"), list):
-        articles = response_data.get("applicable_articles", [])
-        if isinstance(articles, str):
-            # Try to parse comma-separated or newline-separated articles
-            response_data["applicable_articles"] = [
-                a.strip() for a in re.split(r'[,\n]', articles) if a.strip()
-            ]
-        else:
-            response_data["applicable_articles"] = []
-    
-    if not isinstance(response_data.get("risks"), str):
-        response_data["risks"] = str(response_data.get("risks", ""))
-    
-    if not isinstance(response_data.get("advice"), str):
-        response_data["advice"] = str(response_data.get("advice", ""))
+    # Ensure string fields exist and are strings (one lookup per field)
+    for field in _STRING_FIELDS:
+        value = response_data.get(field)
+        if value is None:
+            response_data[field] = ""
+        elif not isinstance(value, str):
+            response_data[field] = str(value)
+    
+    articles = response_data.get("applicable_articles")
+    if isinstance(articles, list):
+        response_data["applicable_articles"] = [
+            a if isinstance(a, str) else str(a) for a in articles
+        ]
+    elif isinstance(articles, str):
+        # Try to parse comma-separated or newline-separated articles
+        response_data["applicable_articles"] = [
+            a.strip() for a in _ARTICLE_SEPARATOR_RE.split(articles) if a.strip()
+        ]
+    else:
+        response_data["applicable_articles"] = []
     
     # Always override disclaimer with canonical one
     response_data["disclaimer"] = LEGAL_DISCLAIMER
@@ -118,7 +136,7 @@ def _parse_text_response(text: str) -> AnalysisResponse:
         "disclaimer": LEGAL_DISCLAIMER
     }
     
-    return AnalysisResponse(**sections)
+    return AnalysisResponse.model_construct(**sections)
 
 
 def _extract_section(text: str, section_name: str) -> str:
@@ -134,13 +152,10 @@ def _extract_section(text: str, section_name: str) -> str:
     """
     
     try:
-        lines = text.split('\n')
-        for i, line in enumerate(lines):
-            if section_name.lower() in line.lower():
-                # Get next 2-3 lines as content
-                content = '\n'.join(lines[i+1:min(i+4, len(lines))])
-                return content.strip()
-        return ""
+        pattern = _SECTION_RES.get(section_name) or _compile_section_re(section_name)
+        # Heading line, then next 2-3 lines as content
+        match = pattern.search(text)
+        return match.group(1).strip() if match else ""
     except Exception:
         return ""
 
@@ -157,28 +172,19 @@ def _extract_articles(text: str) -> list:
     """
     
     try:
-        # Match patterns like "Article 12", "Loi 2023-X", "Décret..."
-        patterns = [
-            r'(Article\s+\d+[A-Za-z]?(?:\s*-\s*[^,\n]*)?)',
-            r'(Loi\s+\d{4}-\d+)',
-            r'(Décret\s+\d{4}-\d+)',
-            r'(Code\s+[A-Za-z]+)',
-        ]
-        
-        articles = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            articles.extend(matches)
-        
-        # Remove duplicates while preserving order
+        # One scan per pattern, duplicates removed while preserving order
         seen = set()
         unique_articles = []
-        for article in articles:
-            if article.strip() not in seen:
-                seen.add(article.strip())
-                unique_articles.append(article.strip())
+        for pattern in _ARTICLE_PATTERNS:
+            for match in pattern.finditer(text):
+                article = match.group().strip()
+                if article not in seen:
+                    seen.add(article)
+                    unique_articles.append(article)
+                    if len(unique_articles) >= MAX_ARTICLES:
+                        return unique_articles  # Limit reached: skip the rest
         
-        return unique_articles[:10]  # Limit to 10 articles
+        return unique_articles
     
     except Exception:
         return []
\ No newline at end of file
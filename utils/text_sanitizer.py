@@ -6,6 +6,17 @@ import re
 from typing import Optional
 from config import PROMPT_INJECTION_KEYWORDS, MAX_TEXT_LENGTH
 
+# Single alternation over all blocked keywords (longest first so "ignore all"
+# wins over "ignore"), plus "system:" with optional spaces; case-insensitive
+_INJECTION_RE = re.compile(
+    "|".join(
+        [re.escape(k) for k in sorted(PROMPT_INJECTION_KEYWORDS, key=len, reverse=True)]
+        + [r"system\s*:"]
+    ),
+    re.IGNORECASE,
+)
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+
 def sanitize_and_validate_text(user_input: Optional[str]) -> str:
     """
     Sanitize user input and prevent prompt injection
@@ -27,16 +38,11 @@ def sanitize_and_validate_text(user_input: Optional[str]) -> str:
     if len(text) > MAX_TEXT_LENGTH:
         text = text[:MAX_TEXT_LENGTH]
     
-    # Check for prompt injection keywords
-    text_lower = text.lower()
-    for keyword in PROMPT_INJECTION_KEYWORDS:
-        if keyword in text_lower:
-            # Replace with neutral marker
-            text = text.replace(keyword, "[REDACTED]")
-        text = re.sub(r'(system\s*:|ignore|bypass|forget|override)', '[REDACTED]', text, flags=re.IGNORECASE)
+    # Replace prompt injection keywords with neutral marker (one pass)
+    text = _INJECTION_RE.sub("[REDACTED]", text)
     
     # Remove multiple consecutive newlines
-    text = re.sub(r'\n{3,}', '\n\n', text)
+    text = _BLANK_LINES_RE.sub('\n\n', text)
     
     return text
 